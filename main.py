@@ -6,7 +6,7 @@ from PySide6.QtWidgets import QApplication, QMainWindow, QWidget, QGridLayout, Q
 from PySide6.QtGui import QPixmap, QFont, QIcon
 from PySide6.QtCore import Qt, QSize
 
-from scripts.lib import ImageGenerator
+from scripts.lib import ImageGenerator, outputFormats
 
 class MainWindow(QMainWindow):
     def __init__(self):
@@ -108,9 +108,12 @@ class MainWindow(QMainWindow):
         cfg = self.left_layout.cfg_textbox.text()
         samples = self.left_layout.samples_textbox.text()
         use_perplexity = self.left_layout.perplexity_checkbox.isChecked()
+        output_format = self.left_layout.format_dropdown.currentText()
+        archive_format = self.left_layout.archive_dropdown.currentText()
+        archive_quality = self.left_layout.quality_textbox.text()
         
         # Set the values
-        self.generator.set_values(api_key, model, aspect, seed, use_random_seed, prompt, negative_prompt, steps, cfg, samples, use_perplexity)
+        self.generator.set_values(api_key, model, aspect, seed, use_random_seed, prompt, negative_prompt, steps, cfg, samples, use_perplexity, output_format, archive_format, archive_quality)
     
         # Generate an image based on the values
         self.generator.generate_image()
@@ -241,21 +244,60 @@ class LeftLayout(QWidget):
         self.layout.addWidget(self.samples_textbox, 10, 1)
         self.layout.addWidget(self.perplexity_checkbox, 10, 2, 1, 2)
 
-        # Twelfth row: Generate button
+        # Twelfth row: Output Format and Archive Format
+        self.format_label = QLabel("Format:")
+        self.format_label.setAlignment(Qt.AlignRight)
+        self.format_dropdown = QComboBox()
+        self.archive_label = QLabel("Archive:")
+        self.archive_label.setAlignment(Qt.AlignRight)
+        self.archive_dropdown = QComboBox()
+        self.archive_dropdown.addItems(specifications["archive_formats"])
+        self.layout.addWidget(self.format_label, 11, 0)
+        self.layout.addWidget(self.format_dropdown, 11, 1)
+        self.layout.addWidget(self.archive_label, 11, 2)
+        self.layout.addWidget(self.archive_dropdown, 11, 3)
+
+        # Thirteenth row: Archive Quality
+        self.quality_label = QLabel("Quality:")
+        self.quality_label.setAlignment(Qt.AlignRight)
+        self.quality_textbox = QLineEdit("90")
+        self.layout.addWidget(self.quality_label, 12, 0)
+        self.layout.addWidget(self.quality_textbox, 12, 1)
+
+        # Fourteenth row: Generate button
         self.generate_button = QPushButton("Generate")
-        self.layout.addWidget(self.generate_button, 11, 0, 1, 4)
+        self.layout.addWidget(self.generate_button, 13, 0, 1, 4)
 
         # Generate Button Click Event
         self.generate_button.clicked.connect(self.clicked_generate)
 
+        # Only offer the output formats the selected model's endpoint can return
+        self.model_dropdown.currentTextChanged.connect(self.update_formats)
+        self.update_formats(self.model_dropdown.currentText())
+
         self.generator = generator
     
+    def update_formats(self, model):
+        current_format = self.format_dropdown.currentText()
+        formats = outputFormats(model)
+        
+        self.format_dropdown.clear()
+        self.format_dropdown.addItems(formats)
+        
+        # Keep the previous choice if the new model supports it
+        if current_format in formats:
+            self.format_dropdown.setCurrentText(current_format)
+        
+        # Nothing to choose when the model only returns one format
+        self.format_dropdown.setEnabled(len(formats) > 1)
+    
     def set_right_layout(self, right_layout):
         self.right_layout = right_layout
 
     def clicked_generate(self):
         # Get All of the Following Values:
-        # api_key, model, aspect, seed, use_random_seed, prompt, negative_prompt, steps, cfg, samples, use_perplexity
+        # api_key, model, aspect, seed, use_random_seed, prompt, negative_prompt, steps, cfg, samples, use_perplexity,
+        # output_format, archive_format, archive_quality
         api_key = self.api_key_textbox.text()
         model = self.model_dropdown.currentText()
         aspect = self.aspect_dropdown.currentText()
@@ -267,9 +309,12 @@ class LeftLayout(QWidget):
         cfg = self.cfg_textbox.text()
         samples = self.samples_textbox.text()
         use_perplexity = self.perplexity_checkbox.isChecked()
+        output_format = self.format_dropdown.currentText()
+        archive_format = self.archive_dropdown.currentText()
+        archive_quality = self.quality_textbox.text()
         
         # Set the values in Generator.set_values
-        self.generator.set_values(api_key, model, aspect, seed, use_random_seed, prompt, negative_prompt, steps, cfg, samples, use_perplexity)
+        self.generator.set_values(api_key, model, aspect, seed, use_random_seed, prompt, negative_prompt, steps, cfg, samples, use_perplexity, output_format, archive_format, archive_quality)
         
         print("Generate button clicked")
         self.generator.generate_image()
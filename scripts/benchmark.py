@@ -0,0 +1,78 @@
+import json
+import argparse
+from os import path
+from shutil import copyfile
+from base64 import b64encode
+from tempfile import TemporaryDirectory
+
+from scripts.lib import outputFormats, transcodeimage
+
+# Formats each path can actually return
+V1_FORMATS = outputFormats("stable-diffusion-xl-1024-v1-0")
+SD3_FORMATS = outputFormats("sd3-large")
+
+def encodeimage(image, image_format, quality=-1):
+    from PySide6.QtCore import QBuffer, QByteArray, QIODevice
+
+    # Encode the image in memory, standing in for what the API would return.
+    # The API picks its own quality, so Qt's default (-1) is used rather than --quality.
+    data = QByteArray()
+    buffer = QBuffer(data)
+    buffer.open(QIODevice.WriteOnly)
+    image.save(buffer, image_format.upper(), int(quality))
+    buffer.close()
+
+    return bytes(data)
+
+def benchmark(location, formats, quality=90):
+    from PySide6.QtGui import QImage
+
+    image = QImage(location)
+    if image.isNull():
+        raise Exception(f"Could not read image: {location}")
+
+    results = []
+    with TemporaryDirectory() as folder:
+        # Work on a copy so archive copies aren't written next to the input image
+        source = f"{folder}/source{path.splitext(location)[1]}"
+        copyfile(location, source)
+
+        for image_format in formats:
+            result = {"format": image_format, "raw_transfer": None, "json_transfer": None, "archive": None}
+
+            # Raw responses are saved as-is, so this is also the size written to disk
+            if image_format in SD3_FORMATS or image_format in V1_FORMATS:
+                encoded = encodeimage(image, image_format)
+                result["raw_transfer"] = len(encoded)
+
+                # Same shape as the v1 'application/json' response, which only ever carries png
+                if image_format in V1_FORMATS:
+                    payload = json.dumps({"artifacts": [{"base64": b64encode(encoded).decode(), "seed": 0, "finishReason": "SUCCESS"}]})
+                    result["json_transfer"] = len(payload.encode())
+
+            # Archive copy of the source image at --quality. A png source archived as png is copied as-is.
+            archive = transcodeimage(source, image_format, quality)
+            if archive is not None:
+                result["archive"] = path.getsize(archive)
+
+            results.append(result)
+
+    return results
+
+def printresults(results):
+    def column(value):
+        return f"{value:>16,}" if value is not None else f"{'-':>16}"
+
+    print(f"{'Format':<8}{'Raw (image/*)':>16}{'Base64 JSON':>16}{'Archive':>16}")
+    for result in results:
+        print(f"{result['format']:<8}{column(result['raw_transfer'])}{column(result['json_transfer'])}{column(result['archive'])}")
+
+if __name__ == "__main__":
+    # Example: python -m scripts.benchmark data/Example.png --quality 80
+    parser = argparse.ArgumentParser(description="Bytes transferred and written per image for each output format.")
+    parser.add_argument("image", nargs="?", default="data/Example.png")
+    parser.add_argument("--formats", nargs="+", default=["png", "jpeg", "webp"])
+    parser.add_argument("--quality", default=90, type=int)
+    args = parser.parse_args()
+
+    printresults(benchmark(args.image, args.formats, args.quality))
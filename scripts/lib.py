@@ -18,12 +18,16 @@ class ImageGenerator():
         self.cfg = ""
         self.samples = ""
         self.use_perplexity = False
+        self.output_format = "png"
+        self.archive_format = ""
+        self.archive_quality = 90
+        self.archive_thread = None
         
         # Others
         self.width = ""
         self.height = ""
     
-    def set_values(self, api_key, model, aspect, seed, use_random_seed, prompt, negative_prompt, steps, cfg, samples, use_perplexity):
+    def set_values(self, api_key, model, aspect, seed, use_random_seed, prompt, negative_prompt, steps, cfg, samples, use_perplexity, output_format="png", archive_format="", archive_quality=90):
         # Default Values
         self.api_key = api_key
         self.model = model
@@ -36,6 +40,17 @@ class ImageGenerator():
         self.samples = samples
         self.use_perplexity = use_perplexity
 
+        # Falls back to png if the endpoint for this model can't return the requested format
+        if output_format in outputFormats(model):
+            self.output_format = output_format
+        else:
+            print(f"{model} does not support {output_format} output. Using png instead.")
+            self.output_format = "png"
+
+        # Archive format of "none" or "" disables background transcoding
+        self.archive_format = "" if archive_format == "none" else archive_format
+        self.archive_quality = parseQuality(archive_quality)
+
         # Sets up the proper widths and heights for the different models
         if model == "stable-diffusion-v1-6":
             self.aspect = aspect.split(" | ")[2]
@@ -63,13 +78,17 @@ class ImageGenerator():
         
         # Generate image based on model
         if self.model in ["sd3-large", "sd3-large-turbo", "sd3-medium", "sd3.5-large", "sd3.5-large-turbo", "sd3.5-medium"]:
-            response = generate_stable3(self.api_key, self.prompt, model=self.model, aspect_ratio=self.aspect, negative_prompt=self.negative_prompt, seed=self.seed)
+            response = generate_stable3(self.api_key, self.prompt, model=self.model, aspect_ratio=self.aspect, negative_prompt=self.negative_prompt, seed=self.seed, output_format=self.output_format)
         if self.model == "stable-diffusion-v1-6" or self.model == "stable-diffusion-xl-1024-v1-0":
             response = generate_nonstable3(self.api_key, self.prompt, engine_id=self.model, cfg=self.cfg, height=self.height, width=self.width, samples=self.samples, steps=self.steps, use_seed=self.use_random_seed, seed_val=self.seed)
         
         # Save images to folder
         locations = saveimages(response, self.model)
         
+        # Transcode archived copies in the background so the GUI isn't held up
+        if self.archive_format:
+            self.archive_thread = transcodeimages(locations, self.archive_format, self.archive_quality)
+        
         # Change current picture to the first image in the list
         if len(locations) == 1:
             self.current_image = locations[0]
@@ -85,6 +104,31 @@ def possibleSamplers():
             'K_DPM_2', 'K_DPM_2_ANCESTRAL', 'K_EULER', 'K_EULER_ANCESTRAL',
             'K_HEUN', 'K_LMS']
 
+def outputFormats(model):
+    # Formats each endpoint can return directly. The v1 endpoints only return png.
+    if model in ["sd3-large", "sd3-large-turbo", "sd3-medium", "sd3.5-large", "sd3.5-large-turbo", "sd3.5-medium"]:
+        return ["png", "jpeg"]
+    return ["png"]
+
+def parseQuality(quality, default=90):
+    # Quality must be a whole number from 0 to 100, otherwise the default is used
+    try:
+        quality = int(quality)
+    except (TypeError, ValueError):
+        print(f"Invalid archive quality '{quality}'. Using {default} instead.")
+        return default
+    
+    if quality < 0 or quality > 100:
+        print(f"Archive quality {quality} is out of range (0-100). Using {default} instead.")
+        return default
+    
+    return quality
+
+def fileExtension(content_type):
+    # Maps a response Content-Type (e.g. 'image/jpeg') to a file extension
+    extensions = {"image/png": "png", "image/jpeg": "jpg", "image/webp": "webp"}
+    return extensions.get(content_type.split(";")[0].strip(), "png")
+
 def createFolders(pathloc):
     from os import mkdir, path
     # Retrieves path in format: './folder1/folder2/folder3'
@@ -100,11 +144,15 @@ def generate_nonstable3(api_key, prompt, engine_id='stable-diffusion-xl-1024-v1-
     from requests import post
     
     api_host = getenv('API_HOST', 'https://api.stability.ai')
+    
+    # Raw image bytes avoid the ~33% base64 overhead, but the API only allows it for a single sample
+    accept = "image/png" if int(samples) == 1 else "application/json"
+    
     response = post(
         f"{api_host}/v1/generation/{engine_id}/text-to-image",
         headers={
             "Content-Type": "application/json",
-            "Accept": "application/json",
+            "Accept": accept,
             "Authorization": f"Bearer {api_key}"
         },
         json={
@@ -127,7 +175,7 @@ def generate_nonstable3(api_key, prompt, engine_id='stable-diffusion-xl-1024-v1-
 
     return response
 
-def generate_stable3(api_key, prompt, model, strength=0.5, aspect_ratio='1:1', seed=0, negative_prompt='', cfg_scale=7):
+def generate_stable3(api_key, prompt, model, strength=0.5, aspect_ratio='1:1', seed=0, negative_prompt='', cfg_scale=7, output_format='png'):
     from os import getenv
     from requests import post
     
@@ -168,7 +216,7 @@ def generate_stable3(api_key, prompt, model, strength=0.5, aspect_ratio='1:1', s
         "aspect_ratio": aspect_ratio,
         "seed": seed,
         "model": model,
-        "output_format": "png",
+        "output_format": output_format,
         "mode": "text-to-image"
     }
     
@@ -204,11 +252,20 @@ def saveimages(data, model):
     # List of image locations
     imagelocs = []
     
+    # Raw image responses are written as-is, using the extension of the returned format
+    content_type = data.headers.get("Content-Type", "")
+    
     if model in ["sd3.5-large", "sd3.5-large-turbo", "sd3.5-medium", "sd3-large", "sd3-large-turbo", "sd3-medium"]:
         image = data.content
-        with open(f'{output_folder}/{current_time}.png', "wb") as f:
+        name = f'{output_folder}/{current_time}.{fileExtension(content_type)}'
+        with open(name, "wb") as f:
             f.write(image)
-            name = f'{output_folder}/{current_time}.png'
+            imagelocs.append(name)
+    
+    elif (model == "stable-diffusion-v1-6" or model == "stable-diffusion-xl-1024-v1-0") and content_type.startswith("image/"):
+        name = f'{output_folder}/{current_time}_0.{fileExtension(content_type)}'
+        with open(name, "wb") as f:
+            f.write(data.content)
             imagelocs.append(name)
             
     elif model == "stable-diffusion-v1-6" or model == "stable-diffusion-xl-1024-v1-0":
@@ -221,6 +278,46 @@ def saveimages(data, model):
             
     return imagelocs
 
+def transcodeimage(location, archive_format='webp', quality=90):
+    from os import path
+    from shutil import copyfile
+    from PySide6.QtGui import QImage
+    
+    # Archive copies go in an 'archive' folder next to the original image
+    folder, filename = path.split(location)
+    archive_folder = f"{folder}/archive"
+    createFolders(archive_folder)
+    
+    extension = "jpg" if archive_format == "jpeg" else archive_format
+    name = f"{archive_folder}/{path.splitext(filename)[0]}.{extension}"
+    
+    # Quality only sets the compression level for png, so re-encoding png to png gains nothing.
+    # Lossy formats are always re-encoded so the quality setting is applied.
+    if archive_format == "png" and path.splitext(filename)[1].lower() == ".png":
+        copyfile(location, name)
+        return name
+    
+    # QImage (unlike QPixmap) is safe to use outside of the GUI thread
+    image = QImage(location)
+    if image.isNull() or not image.save(name, archive_format.upper(), parseQuality(quality)):
+        print(f"Failed to transcode {location} to {archive_format}.")
+        return None
+    
+    return name
+
+def transcodeimages(locations, archive_format='webp', quality=90):
+    from threading import Thread
+    
+    def run():
+        for location in locations:
+            transcodeimage(location, archive_format, quality)
+    
+    # Non-daemon so archives in progress still finish if the window is closed
+    thread = Thread(target=run)
+    thread.start()
+    
+    return thread
+
 def displayimages(data):
     import matplotlib.pyplot as plt
     